@@ -2,20 +2,278 @@ from typing import Callable
 
 from memory import Memory
 
+CYCLES_PER_FRAME = 17556  # machine cycles per frame (70224 clock cycles at 4.194304 MHz, ~59.7 Hz)
+
+
+class Halted(Exception):
+    """Raised when the CPU executes HALT; PC points to the instruction following HALT"""
+
+
+# Flag lookup tables indexed by the 8-bit result of an instruction. Only the bits an instruction family sets are
+# stored, so handlers combine them with the flags they preserve.
+_INC_FLAGS = bytes((0x80 if n == 0 else 0) | (0x20 if (n & 0x0F) == 0x00 else 0) for n in range(256))  # Z 0 H -
+_DEC_FLAGS = bytes((0x80 if n == 0 else 0) | 0x40 | (0x20 if (n & 0x0F) == 0x0F else 0) for n in range(256))  # Z 1 H -
+
+# Rotate lookup tables indexed by the old value of A: the rotated value and the resulting flags (0 0 0 C)
+_RLC_RESULT = bytes(((n << 1) | (n >> 7)) & 0xFF for n in range(256))
+_RLC_FLAGS = bytes((n & 0x80) >> 3 for n in range(256))
+_RRC_RESULT = bytes(((n >> 1) | (n << 7)) & 0xFF for n in range(256))
+_RRC_FLAGS = bytes((n & 0x01) << 4 for n in range(256))
+# Rotate-through-carry tables indexed by the old value of A with the old C flag in bit 8
+_RL_RESULT = bytes(((n << 1) | (n >> 8)) & 0xFF for n in range(512))
+_RL_FLAGS = bytes((n & 0x80) >> 3 for n in range(512))
+_RR_RESULT = bytes((n >> 1) & 0xFF for n in range(512))  # old C shifts into bit 7
+_RR_FLAGS = bytes((n & 0x01) << 4 for n in range(512))
+
+
+# Opcode -> handler, filled at import time by @handles. Handlers are plain functions taking the CPU, so dispatch is a
+# single list index and no per-instance table has to be built. Unregistered opcodes fall back to instr_unimplemented.
+_OPCODES: list[Callable[["CPU"], int | None] | None] = [None] * 256
+
+
+def handles(code: int) -> Callable[[Callable], Callable]:
+    """Decorator registering an instruction handler for the given opcode in the dispatch table"""
+    def register(handler: Callable) -> Callable:
+        _OPCODES[code] = handler
+        return handler
+    return register
+
+
+# Opcode metadata for debugging and disassembly: opcode -> (name, length, cycles, description).
+# Cycles are the base cost in machine cycles; handlers may return a different count (e.g. for taken branches).
+INSTR_META = {
+    0x00: (
+        "NOP",
+        1,
+        1,
+        "Only advances the program counter by 1. Performs no other operations that would have an effect.",
+    ),
+    0x01: (
+        "LD BC, d16",
+        3,
+        3,
+        "Load the 2 bytes of immediate data into register pair BC.",
+    ),
+    0x02: (
+        "LD (BC), A",
+        1,
+        2,
+        "Store the contents of register A in the memory location specified by register pair BC.",
+    ),
+    0x03: (
+        "INC BC",
+        1,
+        2,
+        "Increment the contents of register pair BC by 1.",
+    ),
+    0x07: (
+        "RLCA",
+        1,
+        1,
+        "Rotate register A left through carry flag.",
+    ),
+    0x08: (
+        "LD (a16), SP",
+        3,
+        5,
+        "Store the lower byte of stack pointer SP at the address specified by the 16-bit immediate operand a16, and store the upper byte of SP at address a16 + 1.",
+    ),
+    0x09: (
+        "ADD HL, BC",
+        1,
+        2,
+        "Add the contents of register pair BC to the contents of register pair HL, and store the results in register pair HL.",
+    ),
+    0x0A: (
+        "LD A, (BC)",
+        1,
+        2,
+        "Load the 8-bit contents of memory specified by register pair BC into register A.",
+    ),
+    0x0B: (
+        "DEC BC",
+        1,
+        2,
+        "Decrement the contents of register pair BC by 1.",
+    ),
+    0x0F: (
+        "RRCA",
+        1,
+        1,
+        "Rotate the contents of register A to the right.",
+    ),
+    0x10: (
+        "STOP",
+        2,
+        1,
+        "Execution of a STOP instruction stops both the system clock and oscillator circuit.",
+    ),
+    0x11: (
+        "LD DE, d16",
+        3,
+        3,
+        "Load the 2 bytes of immediate data into register pair DE.",
+    ),
+    0x12: (
+        "LD (DE), A",
+        1,
+        2,
+        "Store the contents of register A in the memory location specified by register pair DE.",
+    ),
+    0x13: (
+        "INC DE",
+        1,
+        2,
+        "Increment the contents of register pair DE by 1.",
+    ),
+    0x17: (
+        "RLA",
+        1,
+        1,
+        "Rotate the contents of register A to the left, through the carry (CY) flag.",
+    ),
+    0x18: (
+        "JR s8",
+        2,
+        3,
+        "Jump s8 steps from the current address in the program counter (PC).",
+    ),
+    0x19: (
+        "ADD HL, DE",
+        1,
+        2,
+        "Add the contents of register pair DE to the contents of register pair HL, and store the results in register pair HL.",
+    ),
+    0x1A: (
+        "LD A, (DE)",
+        1,
+        2,
+        "Load the 8-bit contents of memory specified by register pair DE into register A.",
+    ),
+    0x1B: (
+        "DEC DE",
+        1,
+        2,
+        "Decrement the contents of register pair DE by 1.",
+    ),
+    0x1F: (
+        "RRA",
+        1,
+        1,
+        "",
+    ),
+    0x20: (
+        "JR NZ, s8",
+        2,
+        2,
+        "If the Z flag is 0, jump s8 steps from the current address stored in the program counter (PC). If not, the instruction following the current JP instruction is executed.",
+    ),
+    0x21: (
+        "LD HL, d16",
+        3,
+        3,
+        "Load the 2 bytes of immediate data into register pair HL.",
+    ),
+    0x22: (
+        "LD (HL+), A",
+        1,
+        2,
+        "Store the contents of register A into the memory location specified by register pair HL, and simultaneously increment the contents of HL.",
+    ),
+    0x76: (
+        "HALT",
+        1,
+        1,
+        "Halt the CPU",
+    ),
+    0xC3: (
+        "JP d16",
+        3,
+        4,
+        "Load the 16-bit immediate operand a16 into the program counter (PC).",
+    ),
+}
+
+
+# --- Generated 8-bit register instructions ---
+# INC r, DEC r, LD r, d8 and LD r, r' only differ in the register they touch, so their handlers are generated from
+# the templates below instead of being written out by hand. Registers are listed in opcode encoding order; index 6
+# encodes (HL), which accesses memory and is implemented separately.
+REG8 = ("b", "c", "d", "e", "h", "l", None, "a")
+
+# Per register: the pair it lives in (None for A), an expression reading it and a template writing {} to it.
+# The expressions use a local holding the pair, so each handler loads the pair attribute only once.
+_REG8_ACCESS = {
+    "b": ("bc", "(bc >> 8)", "self.bc = (bc & 0x00FF) | ({} << 8)"),
+    "c": ("bc", "(bc & 0xFF)", "self.bc = (bc & 0xFF00) | {}"),
+    "d": ("de", "(de >> 8)", "self.de = (de & 0x00FF) | ({} << 8)"),
+    "e": ("de", "(de & 0xFF)", "self.de = (de & 0xFF00) | {}"),
+    "h": ("hl", "(hl >> 8)", "self.hl = (hl & 0x00FF) | ({} << 8)"),
+    "l": ("hl", "(hl & 0xFF)", "self.hl = (hl & 0xFF00) | {}"),
+    "a": (None, "self.a", "self.a = {}"),
+}
+
+
+def _reg8_instruction_specs():
+    """Yield (opcode, name, length, cycles, description, handler name, body lines) for each generated instruction"""
+
+    def load(*registers: str) -> list[str]:
+        pairs = dict.fromkeys(_REG8_ACCESS[r][0] for r in registers)  # ordered and without duplicates
+        return [f"{pair} = self.{pair}" for pair in pairs if pair is not None]
+
+    for i, r in enumerate(REG8):
+        if r is None:
+            continue
+        R = r.upper()
+        _, read, write = _REG8_ACCESS[r]
+
+        yield (0x04 + i * 8, f"INC {R}", 1, 1, f"Increment the contents of register {R} by 1.", f"instr_INC_{R}", [
+            *load(r),
+            f"value = ({read} + 1) & 0xFF",
+            write.format("value"),
+            "self.f = (self.f & 0x10) | _INC_FLAGS[value]  # C unchanged",
+        ])
+        yield (0x05 + i * 8, f"DEC {R}", 1, 1, f"Decrement the contents of register {R} by 1.", f"instr_DEC_{R}", [
+            *load(r),
+            f"value = ({read} - 1) & 0xFF",
+            write.format("value"),
+            "self.f = (self.f & 0x10) | _DEC_FLAGS[value]  # C unchanged",
+        ])
+        yield (
+            0x06 + i * 8, f"LD {R}, d8", 2, 2, f"Load the 8-bit immediate operand d8 into register {R}.",
+            f"instr_LD_{R}_d8", [
+                "pc = self.pc",
+                *load(r),
+                write.format("self.memory.read(pc)"),
+                "self.pc = (pc + 1) & 0xFFFF",
+            ]
+        )
 
-class Instruction:
-    def __init__(self, name: str, opcode: int, length: int, cycles: int, description: str, handler: Callable):
-        self.name = name
-        self.opcode = opcode
-        self.length = length
-        self.cycles = cycles
-        self.description = description
-        self.handler = handler
-
-    def __str__(self):
-        return f"{self.name} (0x{self.opcode:02X})"
-
-
+        for j, src in enumerate(REG8):
+            if src is None:
+                continue
+            S = src.upper()
+            body = ["pass"] if src == r else [*load(r, src), write.format(_REG8_ACCESS[src][1])]
+            yield (
+                0x40 + i * 8 + j, f"LD {R}, {S}", 1, 1, f"Load the contents of register {S} into register {R}.",
+                f"instr_LD_{R}_{S}", body,
+            )
+
+
+def _with_reg8_instructions(cls):
+    """Class decorator that compiles the generated 8-bit register handlers into cls and registers them in INSTR_META"""
+    for opcode, name, length, cycles, description, handler_name, body in _reg8_instruction_specs():
+        source = "\n    ".join([f"def {handler_name}(self):", f"# 0x{opcode:02X}", *body])
+        namespace = {}
+        exec(source, globals(), namespace)
+        handler = namespace[handler_name]
+        handler.__qualname__ = f"{cls.__name__}.{handler_name}"
+        setattr(cls, handler_name, handles(opcode)(handler))
+        INSTR_META[opcode] = (name, length, cycles, description)
+    return cls
+
+
+@_with_reg8_instructions
 class CPU:
     """
     CPU class for the Game Boy.
@@ -28,761 +286,359 @@ class CPU:
     address.
     """
 
+    # Fixed attribute layout: registers live in slots instead of a per-instance __dict__
+    __slots__ = ("a", "bc", "de", "f", "hl", "memory", "pc", "sp")
+
     def __init__(self, memory: Memory) -> None:
         self.memory = memory
-        self._pc = 0x0100  # Start execution here
-        self._sp = 0xFFFE  # Stack pointer (top of stack)
-
-        # 8-bit registers (internal storage)
-        self._a = 0x01
-        self._f = 0x00  # Flags: Z N H C (bit 7 to bit 4)
-        self._b = self._c = self._d = self._e = self._h = self._l = 0x00
+        self.reset()
 
-        self.halted = False
-        self.instructions = self.build_instruction_table()
+    def reset(self) -> None:
+        """Set all registers to their power-on values; memory is left untouched"""
+        # Registers are plain attributes; instruction handlers mask to 8/16 bits at every assignment site.
+        self.pc = 0x0100  # 16-bit Program Counter, start execution here
+        self.sp = 0xFFFE  # 16-bit Stack pointer (top of stack)
 
-    def step(self):
-        if self.halted:
-            return 0  # No cycles consumed when halted
-
-        opcode = self.memory[self.pc]
-        self.pc += 1
-        self.pc &= 0xFFFF
+        # 8-bit registers
+        self.a = 0x01  # Accumulator
+        self.f = 0x00  # Flags: Z N H C (bit 7 to bit 4), lower 4 bits always zero
 
-        instruction = self.instructions.get(
-            opcode, Instruction("not implemented", 0, 0, 0, "", self.instr_unimplemented)
-        )
-        cycles = instruction.cycles
+        # 16-bit register pairs, stored whole since most accesses (addressing, 16-bit arithmetic) use the pair
+        self.bc = self.de = self.hl = 0x0000
 
-        # Execute instruction and check if it returns a custom cycle count
-        result = instruction.handler()
-        if result is not None:
-            cycles = result
+    def step(self):
+        """Execute a single instruction and return the number of cycles it consumed"""
+        return self.run(1)
+
+    def run(self, n: int) -> int:
+        """Execute n instructions and return the number of cycles consumed"""
+        # Dispatch is inlined and hot lookups are bound to locals, so running a batch costs one call instead of n
+        fetch = self.memory.buffer  # PC is always masked to 16 bits, so opcodes are fetched by plain indexing
+        handlers = _OPCODES
+        cycles_table = _CYCLES
+
+        cycles = 0
+        for _ in range(n):
+            pc = self.pc
+            opcode = fetch[pc]
+            self.pc = (pc + 1) & 0xFFFF
+
+            # Execute instruction and check if it returns a custom cycle count
+            result = handlers[opcode](self)
+            cycles += cycles_table[opcode] if result is None else result
 
         return cycles
 
-    # --- PC Property ---
+    def run_for(self, target_cycles: int) -> int:
+        """
+        Execute instructions until at least target_cycles machine cycles have elapsed.
 
-    @property
-    def pc(self) -> int:
-        """16-bit Program Counter"""
-        return self._pc
+        Returns the number of cycles consumed, which may overshoot target_cycles by the length of the last instruction.
+        Running in chunks (e.g. one frame) leaves natural points to service the PPU, timers and interrupts in between.
+        Raises Halted if the CPU executes HALT.
+        """
+        # Same loop as run(), bounded by cycles instead of instructions
+        fetch = self.memory.buffer  # PC is always masked to 16 bits, so opcodes are fetched by plain indexing
+        handlers = _OPCODES
+        cycles_table = _CYCLES
 
-    @pc.setter
-    def pc(self, value: int) -> None:
-        """Set PC with automatic 16-bit wrapping"""
-        self._pc = value & 0xFFFF
+        cycles = 0
+        while cycles < target_cycles:
+            pc = self.pc
+            opcode = fetch[pc]
+            self.pc = (pc + 1) & 0xFFFF
 
-    # --- SP Property ---
+            result = handlers[opcode](self)
+            cycles += cycles_table[opcode] if result is None else result
 
-    @property
-    def sp(self) -> int:
-        """16-bit Stack Pointer"""
-        return self._sp
+        return cycles
 
-    @sp.setter
-    def sp(self, value: int) -> None:
-        """Set SP with automatic 16-bit wrapping"""
-        self._sp = value & 0xFFFF
+    # --- Debugging ---
 
-    # --- 8-bit Register Properties ---
+    def print_registers(self):
+        print(f"AF: {self.af:04X}")
+        print(f"BC: {self.bc:04X}")
+        print(f"DE: {self.de:04X}")
+        print(f"HL: {self.hl:04X}")
+        print(f"SP: {self.sp:04X}")
+        print(f"PC: {self.pc:04X}")
 
-    @property
-    def a(self) -> int:
-        """8-bit accumulator register"""
-        return self._a
+    def print_flags(self):
+        print("Z N H C")
+        print(
+            f"{int(self.f & 0x80 != 0)} {int(self.f & 0x40 != 0)} {int(self.f & 0x20 != 0)} {int(self.f & 0x10 != 0)}"
+        )
 
-    @a.setter
-    def a(self, value: int) -> None:
-        self._a = value & 0xFF
+    # --- Register Properties ---
+    # Convenience accessors for debugging and tests; instruction handlers work on a, f and the pairs directly.
 
     @property
-    def f(self) -> int:
-        """8-bit flags register (only bits 4-7 are used)"""
-        return self._f
+    def af(self) -> int:
+        """16-bit AF register (A << 8 | F)"""
+        return (self.a << 8) | self.f
 
-    @f.setter
-    def f(self, value: int) -> None:
-        self._f = value & 0xF0  # Only lower 4 bits are used for flags
+    @af.setter
+    def af(self, value: int) -> None:
+        value = value & 0xFFFF
+        self.a = value >> 8
+        self.f = value & 0xF0  # Only upper 4 bits of F are used for flags
 
     @property
     def b(self) -> int:
-        """8-bit B register"""
-        return self._b
+        """8-bit B register (upper byte of BC)"""
+        return self.bc >> 8
 
     @b.setter
     def b(self, value: int) -> None:
-        self._b = value & 0xFF
+        self.bc = (self.bc & 0x00FF) | ((value & 0xFF) << 8)
 
     @property
     def c(self) -> int:
-        """8-bit C register"""
-        return self._c
+        """8-bit C register (lower byte of BC)"""
+        return self.bc & 0xFF
 
     @c.setter
     def c(self, value: int) -> None:
-        self._c = value & 0xFF
+        self.bc = (self.bc & 0xFF00) | (value & 0xFF)
 
     @property
     def d(self) -> int:
-        """8-bit D register"""
-        return self._d
+        """8-bit D register (upper byte of DE)"""
+        return self.de >> 8
 
     @d.setter
     def d(self, value: int) -> None:
-        self._d = value & 0xFF
+        self.de = (self.de & 0x00FF) | ((value & 0xFF) << 8)
 
     @property
     def e(self) -> int:
-        """8-bit E register"""
-        return self._e
+        """8-bit E register (lower byte of DE)"""
+        return self.de & 0xFF
 
     @e.setter
     def e(self, value: int) -> None:
-        self._e = value & 0xFF
+        self.de = (self.de & 0xFF00) | (value & 0xFF)
 
     @property
     def h(self) -> int:
-        """8-bit H register"""
-        return self._h
+        """8-bit H register (upper byte of HL)"""
+        return self.hl >> 8
 
     @h.setter
     def h(self, value: int) -> None:
-        self._h = value & 0xFF
+        self.hl = (self.hl & 0x00FF) | ((value & 0xFF) << 8)
 
     @property
     def l(self) -> int:
-        """8-bit L register"""
-        return self._l
+        """8-bit L register (lower byte of HL)"""
+        return self.hl & 0xFF
 
     @l.setter
     def l(self, value: int) -> None:
-        self._l = value & 0xFF
-
-    # --- Flag Handling Methods ---
-
-    def _set_flags(
-        self, zero: bool = None, subtract: bool = None, half_carry: bool = None, carry: bool = None
-    ) -> None:
-        """Set flags based on operation result and conditions"""
-        flags = 0
-
-        # Z flag (bit 7) - set if result is zero
-        if zero is not None:
-            flags |= (1 if zero else 0) << 7
-
-        # N flag (bit 6) - set if operation was subtraction
-        if subtract is not None:
-            flags |= (1 if subtract else 0) << 6
-
-        # H flag (bit 5) - set if there was half carry/borrow
-        if half_carry is not None:
-            flags |= (1 if half_carry else 0) << 5
-
-        # C flag (bit 4) - set if there was carry/borrow
-        if carry is not None:
-            flags |= (1 if carry else 0) << 4
-
-        # Preserve existing flags that weren't explicitly set
-        mask = 0
-        if zero is not None:
-            mask |= 0x80
-        if subtract is not None:
-            mask |= 0x40
-        if half_carry is not None:
-            mask |= 0x20
-        if carry is not None:
-            mask |= 0x10
-
-        # Clear the bits we're setting, preserve the others
-        self._f = (self._f & ~mask) | (flags & mask)
-
-    def _check_half_carry_sub(self, a: int, b: int) -> bool:
-        """Check for half carry in subtraction (borrow from bit 4)"""
-        return (a & 0x0F) < (b & 0x0F)
-
-    def _check_half_carry_add(self, a: int, b: int) -> bool:
-        """Check for half carry in addition (carry to bit 4)"""
-        return ((a & 0x0F) + (b & 0x0F)) > 0x0F
-
-    def print_registers(self):
-        print(f"AF: {self.af:04X}")
-        print(f"BC: {self.bc:04X}")
-        print(f"DE: {self.de:04X}")
-        print(f"HL: {self.hl:04X}")
-        print(f"SP: {self.sp:04X}")
-        print(f"PC: {self.pc:04X}")
-
-    def print_flags(self):
-        print("Z N H C")
-        print(
-            f"{int(self.f & 0x80 != 0)} {int(self.f & 0x40 != 0)} {int(self.f & 0x20 != 0)} {int(self.f & 0x10 != 0)}"
-        )
-
-    # --- 16-bit Register Properties ---
-
-    @property
-    def af(self) -> int:
-        """16-bit AF register (A << 8 | F)"""
-        return (self.a << 8) | self.f
-
-    @af.setter
-    def af(self, value: int) -> None:
-        value = value & 0xFFFF
-        self.a = value >> 8
-        self.f = value & 0xF0  # Only lower 4 bits of F are used for flags
-
-    @property
-    def bc(self) -> int:
-        """16-bit BC register (B << 8 | C)"""
-        return (self.b << 8) | self.c
-
-    @bc.setter
-    def bc(self, value: int) -> None:
-        value = value & 0xFFFF
-        self.b = value >> 8
-        self.c = value & 0xFF
-
-    @property
-    def de(self) -> int:
-        """16-bit DE register (D << 8 | E)"""
-        return (self.d << 8) | self.e
-
-    @de.setter
-    def de(self, value: int) -> None:
-        value = value & 0xFFFF
-        self.d = value >> 8
-        self.e = value & 0xFF
-
-    @property
-    def hl(self) -> int:
-        """16-bit HL register (H << 8 | L)"""
-        return (self.h << 8) | self.l
-
-    @hl.setter
-    def hl(self, value: int) -> None:
-        value = value & 0xFFFF
-        self.h = value >> 8
-        self.l = value & 0xFF
-
-    def build_instruction_table(self):
-        return {
-            0x00: Instruction(
-                "NOP",
-                0x00,
-                1,
-                1,
-                "Only advances the program counter by 1. Performs no other operations that would have an effect.",
-                self.instr_NOP,
-            ),
-            0x01: Instruction(
-                "LD BC, d16",
-                0x01,
-                3,
-                3,
-                "Load the 2 bytes of immediate data into register pair BC.",
-                self.instr_LD_BC_d16,
-            ),
-            0x02: Instruction(
-                "LD (BC), A",
-                0x02,
-                1,
-                2,
-                "Store the contents of register A in the memory location specified by register pair BC.",
-                self.instr_LD_BC_A,
-            ),
-            0x03: Instruction(
-                "INC BC", 0x03, 1, 2, "Increment the contents of register pair BC by 1.", self.instr_INC_BC
-            ),
-            0x04: Instruction("INC B", 0x04, 1, 1, "Increment the contents of register B by 1.", self.instr_INC_B),
-            0x05: Instruction("DEC B", 0x05, 1, 1, "Decrement the contents of register B by 1.", self.instr_DEC_B),
-            0x06: Instruction(
-                "LD B, d8", 0x06, 2, 2, "Load the 8-bit immediate operand d8 into register B.", self.instr_LD_B_d8
-            ),
-            0x07: Instruction("RLCA", 0x07, 1, 1, "Rotate register A left through carry flag.", self.instr_RLCA),
-            0x08: Instruction(
-                "LD (a16), SP",
-                0x08,
-                3,
-                5,
-                "Store the lower byte of stack pointer SP at the address specified by the 16-bit immediate operand a16, and store the upper byte of SP at address a16 + 1.",
-                self.instr_LD_a16_SP
-            ),
-            0x09: Instruction(
-                "ADD HL, BC",
-                0x09,
-                1,
-                2,
-                "Add the contents of register pair BC to the contents of register pair HL, and store the results in register pair HL.",
-                self.instr_ADD_HL_BC
-            ),
-            0x0A: Instruction(
-                "LD A, (BC)",
-                0x0A,
-                1,
-                2,
-                "Load the 8-bit contents of memory specified by register pair BC into register A.",
-                self.instr_LD_A_BC
-            ),
-            0x0B: Instruction(
-                "DEC BC",
-                0x0B,
-                1,
-                2,
-                "Decrement the contents of register pair BC by 1.",
-                self.instr_DEC_BC
-            ),
-            0x0C: Instruction(
-                "INC C",
-                0x0C,
-                1,
-                1,
-                "Increment the contents of register C by 1.",
-                self.instr_INC_C
-            ),
-            0x0D: Instruction(
-                "DEC C",
-                0x0D,
-                1,
-                1,
-                "Decrement the contents of register C by 1.",
-                self.instr_DEC_C
-            ),
-            0x0E: Instruction(
-                "LD C, d8",
-                0x0E,
-                2,
-                2,
-                "Load the 8-bit immediate operand d8 into register C.",
-                self.instr_LD_C_d8
-            ),
-            0x0F: Instruction(
-                "RRCA",
-                0x0F,
-                1,
-                1,
-                "Rotate the contents of register A to the right.",
-                self.instr_RRCA
-            ),
-            0x10: Instruction(
-                "STOP",
-                0x10,
-                2,
-                1,
-                "Execution of a STOP instruction stops both the system clock and oscillator circuit.",
-                self.instr_STOP
-            ),
-            0x11: Instruction(
-                "LD DE, d16",
-                0x11,
-                3,
-                3,
-                "Load the 2 bytes of immediate data into register pair DE.",
-                self.instr_LD_DE_d16
-            ),
-            0x12: Instruction(
-                "LD (DE), A",
-                0x12,
-                1,
-                2,
-                "Store the contents of register A in the memory location specified by register pair DE.",
-                self.instr_LD_DE_A
-            ),
-            0x13: Instruction(
-                "INC DE",
-                0x13,
-                1,
-                2,
-                "Increment the contents of register pair DE by 1.",
-                self.instr_INC_DE
-            ),
-            0x14: Instruction(
-                "INC D",
-                0x14,
-                1,
-                1,
-                "Increment the contents of register D by 1.",
-                self.instr_INC_D
-            ),
-            0x15: Instruction(
-                "DEC D",
-                0x15,
-                1,
-                1,
-                "Decrement the contents of register D by 1.",
-                self.instr_DEC_D
-            ),
-            0x16: Instruction(
-                "LD D, d8",
-                0x16,
-                2,
-                2,
-                "Load the 8-bit immediate operand d8 into register D.",
-                self.instr_LD_D_d8
-
-            ),
-            0x17: Instruction(
-                "RLA",
-                0x17,
-                1,
-                1,
-                "Rotate the contents of register A to the left, through the carry (CY) flag.",
-                self.instr_RLA
-            ),
-            0x18: Instruction(
-                "JR s8",
-                0x18,
-                2,
-                3,
-                "Jump s8 steps from the current address in the program counter (PC).",
-                self.instr_JR_s8
-            ),
-            0x19: Instruction(
-                "ADD HL, DE",
-                0x19,
-                1,
-                2,
-                "Add the contents of register pair DE to the contents of register pair HL, and store the results in register pair HL.",
-                self.instr_ADD_HL_DE
-            ),
-            0x1A: Instruction(
-                "LD A, (DE)",
-                0x1A,
-                1,
-                2,
-                "Load the 8-bit contents of memory specified by register pair DE into register A.",
-                self.instr_LD_A_DE
-            ),
-            0x1B: Instruction(
-                "DEC DE",
-                0x1B,
-                1,
-                2,
-                "Decrement the contents of register pair DE by 1.",
-                self.instr_DEC_DE
-            ),
-            0x1C: Instruction(
-                "INC E",
-                0x1C,
-                1,
-                1,
-                "Increment the contents of register E by 1.",
-                self.instr_INC_E
-            ),
-            0x1D: Instruction(
-                "DEC E",
-                0x1D,
-                1,
-                1,
-                "Decrement the contents of register E by 1.",
-                self.instr_DEC_E
-            ),
-            0x1E: Instruction(
-                "LD E, d8",
-                0x01E,
-                2,
-                2,
-                "Load the 8-bit immediate operand d8 into register E.",
-                self.instr_LD_E_d8
-            ),
-            0x1F: Instruction(
-                "RRA",
-                0x1F,
-                1,
-                1,
-                "",
-                self.instr_RRA
-            ),
-            0x20: Instruction(
-                "JR NZ, s8",
-                0x20,
-                2,
-                2,
-                "If the Z flag is 0, jump s8 steps from the current address stored in the program counter (PC). If not, the instruction following the current JP instruction is executed.",
-                self.instr_JR_NZ_s8
-            ),
-            0x21: Instruction(
-                "LD HL, d16",
-                0x21,
-                3,
-                3,
-                "Load the 2 bytes of immediate data into register pair HL.",
-                self.instr_LD_HL_d16
-
-            ),
-            0x22: Instruction(
-                "LD (HL+), A",
-                0x22,
-                1,
-                2,
-                "Store the contents of register A into the memory location specified by register pair HL, and simultaneously increment the contents of HL.",
-                self.instr_LD_HL_plus_A
-            ),
-            0x3E: Instruction(
-                "LD A, d8",
-                0x3E,
-                2,
-                2,
-                "Load the 8-bit immediate operand d8 into register A.",
-                self.instr_LD_A_d8,
-            ),
-            0x47: Instruction(
-                "LD B, A",
-                0x47,
-                1,
-                1,
-                "Load the contents of register A into register B.",
-                self.instr_LD_B_A,
-            ),
-            0x76: Instruction("HALT", 0x76, 1, 1, "Halt the CPU", self.instr_HALT),
-            0x78: Instruction(
-                "LD A, B",
-                0x78,
-                1,
-                1,
-                "Load the contents of register B into register A.",
-                self.instr_LD_A_B,
-            ),
-            0xC3: Instruction(
-                "JP d16",
-                0xC3,
-                3,
-                4,
-                "Load the 16-bit immediate operand a16 into the program counter (PC).",
-                self.instr_JP_d16,
-            ),
-            # 0xFF
-        }
+        self.hl = (self.hl & 0xFF00) | (value & 0xFF)
 
     def instr_unimplemented(self):
-        opcode = self.memory[self.pc - 1]
+        opcode = self.memory.read((self.pc - 1) & 0xFFFF)
         raise NotImplementedError(f"Opcode 0x{opcode:02X} not implemented")
 
     # --- Instruction Implementations ---
 
+    @handles(0x00)
     def instr_NOP(self):
         # 0x00
         pass
 
+    @handles(0x01)
     def instr_LD_BC_d16(self):
         # 0x01
-        self.c = self.memory[self.pc]
-        self.b = self.memory[self.pc + 1]
-        self.pc += 2
+        pc = self.pc
+        self.bc = self.memory.read16(pc)
+        self.pc = (pc + 2) & 0xFFFF
 
+    @handles(0x02)
     def instr_LD_BC_A(self):
         # 0x02
-        self.memory[self.bc] = self.a
+        self.memory.store(self.bc, self.a)
 
+    @handles(0x03)
     def instr_INC_BC(self):
         # 0x03
-        self.bc = self.bc + 1
-
-    def instr_INC_B(self):
-        # 0x04
-        old_value = self.b
-        self.b += 1
-        self._set_flags(zero=self.b == 0, half_carry=self._check_half_carry_add(old_value, 1))
-
-    def instr_DEC_B(self):
-        # 0x05
-        old_value = self.b
-        self.b -= 1
-        self._set_flags(zero=self.b == 0, half_carry=self._check_half_carry_sub(old_value, 1), subtract=True)
-
-    def instr_LD_B_d8(self):
-        # 0x06
-        self.b = self.memory[self.pc]
-        self.pc += 1
+        self.bc = (self.bc + 1) & 0xFFFF
 
+    @handles(0x07)
     def instr_RLCA(self):
         # 0x07
         old_value = self.a
-        self.a = ((self.a << 1) | (self.a >> 7)) & 0xFF
-        self._set_flags(zero=False, subtract=False, half_carry=False, carry=(old_value & 0x80) != 0)
+        self.a = _RLC_RESULT[old_value]
+        self.f = _RLC_FLAGS[old_value]
 
+    @handles(0x08)
     def instr_LD_a16_SP(self):
         # 0x08
-        pointer = self.memory[self.pc] | (self.memory[self.pc+1] << 8)
-        self.memory[pointer] = self.sp & 0x00FF  # Lower byte of SP
-        self.memory[pointer + 1] = (self.sp >> 8) & 0x00FF  # Upper byte of SP
-        self.pc += 2
-
+        memory = self.memory
+        pc = self.pc
+        sp = self.sp
+        pointer = memory.read16(pc)
+        memory.store(pointer, sp & 0x00FF)  # Lower byte of SP
+        memory.store((pointer + 1) & 0xFFFF, sp >> 8)  # Upper byte of SP
+        self.pc = (pc + 2) & 0xFFFF
+
+    @handles(0x09)
     def instr_ADD_HL_BC(self):
         # 0x09
         old_hl = self.hl
-        result = old_hl + self.bc
+        bc = self.bc
+        result = old_hl + bc
 
-        # Store result (automatically wrapped to 16 bits by property setter)
-        self.hl = result
+        # Store result wrapped to 16 bits
+        self.hl = result & 0xFFFF
 
         # Set flags: Z is unchanged, N=0, H=half_carry, C=carry
-        self._set_flags(subtract=False, half_carry=((old_hl & 0x0FFF) + (self.bc & 0x0FFF)) > 0x0FFF, carry=result > 0xFFFF)
+        self.f = (
+            (self.f & 0x80)
+            | (0x20 if ((old_hl & 0x0FFF) + (bc & 0x0FFF)) > 0x0FFF else 0)
+            | (0x10 if result > 0xFFFF else 0)
+        )
 
+    @handles(0x0A)
     def instr_LD_A_BC(self):
         # 0x0A
-        self.a = self.memory[self.bc]
+        self.a = self.memory.read(self.bc)
 
+    @handles(0x0B)
     def instr_DEC_BC(self):
         # 0x0B
-        self.bc -= 1
-
-    def instr_INC_C(self):
-        # 0x0C
-        old_value = self.c
-        self.c += 1
-        self._set_flags(zero=self.c == 0, subtract=False, half_carry=self._check_half_carry_add(old_value, 1))
-
-    def instr_DEC_C(self):
-        # 0x0D
-        old_value = self.c
-        self.c -= 1
-        self._set_flags(zero=self.c == 0, subtract=True, half_carry=self._check_half_carry_sub(old_value, 1))
-
-    def instr_LD_C_d8(self):
-        # 0x0E
-        self.c = self.memory[self.pc]
-        self.pc += 1
+        self.bc = (self.bc - 1) & 0xFFFF
 
+    @handles(0x0F)
     def instr_RRCA(self):
         # 0x0F
         old_value = self.a
-        self.a = ((self.a >> 1) | (self.a << 7)) & 0xFF
-        self._set_flags(zero=False, subtract=False, half_carry=False, carry=(old_value & 0x01) != 0)
+        self.a = _RRC_RESULT[old_value]
+        self.f = _RRC_FLAGS[old_value]
 
+    @handles(0x10)
     def instr_STOP(self):
         # 0x10
         # STOP is not used in any licensed ROM and therefore implemented as NOP here.
-        self.pc += 1
+        self.pc = (self.pc + 1) & 0xFFFF
 
+    @handles(0x11)
     def instr_LD_DE_d16(self):
         # 0x11
-        self.de = self.memory[self.pc] | (self.memory[self.pc+1] << 8)
-        self.pc += 2
+        pc = self.pc
+        self.de = self.memory.read16(pc)
+        self.pc = (pc + 2) & 0xFFFF
 
+    @handles(0x12)
     def instr_LD_DE_A(self):
         # 0x12
-        self.memory[self.de] = self.a
+        self.memory.store(self.de, self.a)
 
+    @handles(0x13)
     def instr_INC_DE(self):
         # 0x13
-        self.de += 1
-
-    def instr_INC_D(self):
-        # 0x14
-        old_value = self.d
-        self.d += 1
-        self._set_flags(zero=self.d == 0, subtract=False, half_carry=self._check_half_carry_add(old_value, 1))
-
-    def instr_DEC_D(self):
-        # 0x15
-        old_value = self.d
-        self.d -= 1
-        self._set_flags(zero=self.d == 0, subtract=True, half_carry=self._check_half_carry_sub(old_value, 1))
-
-    def instr_LD_D_d8(self):
-        # 0x16
-        self.d = self.memory[self.pc]
+        self.de = (self.de + 1) & 0xFFFF
 
+    @handles(0x17)
     def instr_RLA(self):
         # 0x17
-        old_value = self.a
-        self.a = ((self.a << 1) | ((self.f & 0x10) >> 4)) & 0xFF
-        self._set_flags(zero=False, subtract=False, half_carry=False, carry=(old_value & 0x80) > 0)
+        index = self.a | ((self.f & 0x10) << 4)
+        self.a = _RL_RESULT[index]
+        self.f = _RL_FLAGS[index]  # C is the old bit 7, Z, N and H are reset
 
+    @handles(0x18)
     def instr_JR_s8(self):
         # 0x18
-        s8 = self.memory[self.pc]
-        self.pc += 1  # Move PC to point after the instruction
+        pc = self.pc
+        s8 = self.memory.read(pc)
 
         # Using two's complement conversion
         if s8 >= 0x80:  # If bit 7 is set (negative number)
             s8 -= 0x100  # Shift from [0, 255] to [-128, 127]
-        self.pc += s8
+        self.pc = (pc + 1 + s8) & 0xFFFF  # Offset is relative to the address after the instruction
 
+    @handles(0x19)
     def instr_ADD_HL_DE(self):
         # 0x19
         old_value = self.hl
-        new_value = self.hl + self.de
-        self.hl = new_value
-        self._set_flags(
-            subtract=False,
-            half_carry=((old_value & 0x0FFF) + (self.de & 0x0FFF)) > 0x0FFF,  # set if overflow from bit 11
-            carry=new_value > 0xFFFF  # set if overflow from bit 15
+        de = self.de
+        new_value = old_value + de
+        self.hl = new_value & 0xFFFF
+        self.f = (
+            (self.f & 0x80)  # Z unchanged, N=0
+            | (0x20 if ((old_value & 0x0FFF) + (de & 0x0FFF)) > 0x0FFF else 0)  # set if overflow from bit 11
+            | (0x10 if new_value > 0xFFFF else 0)  # set if overflow from bit 15
         )
 
+    @handles(0x1A)
     def instr_LD_A_DE(self):
         # 0x1A
-        self.a = self.memory[self.de]
+        self.a = self.memory.read(self.de)
 
+    @handles(0x1B)
     def instr_DEC_DE(self):
         # 0x1B
-        self.de -= 1
-
-    def instr_INC_E(self):
-        # 0x1C
-        old_value = self.e
-        self.e += 1
-        self._set_flags(zero=self.e == 0, subtract=False, half_carry=self._check_half_carry_add(old_value, 1))
-
-    def instr_DEC_E(self):
-        # 0x1D
-        old_value = self.e
-        self.e -= 1
-        self._set_flags(zero=self.e == 0, subtract=True, half_carry=self._check_half_carry_sub(old_value, 1))
-
-    def instr_LD_E_d8(self):
-        # 0x1E
-        self.e = self.memory[self.pc]
-        self.pc += 1
+        self.de = (self.de - 1) & 0xFFFF
 
+    @handles(0x1F)
     def instr_RRA(self):
         # 0x1F
-        old_value = self.a
-        self.a = ((self.a >> 1) | ((self.f & 0x10) << 3)) & 0xFF
-        self._set_flags(zero=False, subtract=False, half_carry=False, carry=(old_value & 0x01) != 0)
+        index = self.a | ((self.f & 0x10) << 4)
+        self.a = _RR_RESULT[index]
+        self.f = _RR_FLAGS[index]  # C is the old bit 0, Z, N and H are reset
 
+    @handles(0x20)
     def instr_JR_NZ_s8(self):
         # 0x20
-        jump_offset = self.memory[self.pc]
-        self.pc += 1  # Move PC past the offset byte
+        pc = self.pc
 
         # Check if Z flag is 0 (not zero)
         if (self.f & 0x80) == 0:
+            jump_offset = self.memory.read(pc)
             # Convert unsigned offset to signed (two's complement)
             if jump_offset >= 0x80:  # If bit 7 is set (negative number)
                 jump_offset -= 0x100  # Convert to range [-128, 127]
-            self.pc += jump_offset
+            self.pc = (pc + 1 + jump_offset) & 0xFFFF  # Offset is relative to the address after the instruction
             return 3  # 3 cycles if jump taken
 
+        self.pc = (pc + 1) & 0xFFFF  # Skip the offset byte
+
+    @handles(0x21)
     def instr_LD_HL_d16(self):
         # 0x21
-        self.hl = self.memory[self.pc] | (self.memory[self.pc+1] << 8)
-        self.pc += 2
+        pc = self.pc
+        self.hl = self.memory.read16(pc)
+        self.pc = (pc + 2) & 0xFFFF
 
+    @handles(0x22)
     def instr_LD_HL_plus_A(self):
         # 0x22
-        self.memory[self.hl] = self.a
-        self.hl += 1
-
-    def instr_LD_B_A(self):
-        # 0x47
-        self.b = self.a
+        hl = self.hl
+        self.memory.store(hl, self.a)
+        self.hl = (hl + 1) & 0xFFFF
 
+    @handles(0x76)
     def instr_HALT(self):
         # 0x76
-        self.halted = True
-
-    def instr_LD_A_B(self):
-        # 0x78
-        self.a = self.b
-
-    def instr_LD_A_d8(self):
-        # 0x3E
-        self.a = self.memory[self.pc]
-        self.pc += 1
+        # Halting is rare and terminal, so it is signalled by an exception rather than a flag checked on every step
+        raise Halted
 
+    @handles(0xC3)
     def instr_JP_d16(self):
         # 0xC3
-        value = self.memory[self.pc] | (self.memory[self.pc+1] << 8)
-        self.pc = value
+        self.pc = self.memory.read16(self.pc)
+
+
+# Every registered handler needs metadata (its base cycle count in particular) and every opcode with metadata needs a
+# handler; otherwise an instruction would silently cost 0 cycles or dispatch to instr_unimplemented
+_mismatched = [code for code in range(256) if (_OPCODES[code] is None) != (code not in INSTR_META)]
+if _mismatched:
+    raise RuntimeError(
+        "Opcodes without both a handler and an INSTR_META entry: " + ", ".join(f"0x{c:02X}" for c in _mismatched)
+    )
+del _mismatched
+
+# Complete the dispatch tables once all handlers are registered
+_OPCODES[:] = [CPU.instr_unimplemented if handler is None else handler for handler in _OPCODES]
+_CYCLES = bytes(INSTR_META[code][2] if code in INSTR_META else 0 for code in range(256))  # base cycles by opcode
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
 class MBC(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def read(self, address: int) -> int:
         pass
@@ -9,9 +11,21 @@ class MBC(ABC):
     def write(self, address: int, value: int) -> None:
         pass
 
+    @abstractmethod
+    def reset(self) -> None:
+        """Return the controller to its power-on state"""
+
+    @property
+    @abstractmethod
+    def mapped_banks(self) -> tuple[memoryview, memoryview]:
+        """ROM banks currently mapped at 0x0000-0x3FFF and 0x4000-0x7FFF"""
+
 class NoMBC(MBC):
+    __slots__ = ("_banks", "rom")
+
     def __init__(self, rom: bytes) -> None:
-        self.rom = rom
+        self.rom = memoryview(rom).cast("B")  # unsigned byte view of any ROM buffer; slicing is zero-copy
+        self._banks = (self.rom[:0x4000], self.rom[0x4000:0x8000])
 
     def read(self, address: int) -> int:
         return self.rom[address]
@@ -19,21 +33,44 @@ class NoMBC(MBC):
     def write(self, address: int, value: int) -> None:
         pass  # ROM is read-only; no bank switching
 
+    def reset(self) -> None:
+        pass  # no controller state
+
+    @property
+    def mapped_banks(self) -> tuple[memoryview, memoryview]:
+        return self._banks
+
 class MBC1(MBC):
+    __slots__ = ("_bank0", "_banks", "_cur_bank", "rom", "rom_bank")
+
     def __init__(self, rom: bytes) -> None:
-        self.rom = rom
-        self.rom_bank = 0x01
+        self.rom = memoryview(rom).cast("B")  # unsigned byte view of any ROM buffer; slicing is zero-copy
+
+        # Zero-copy views of all 16 KiB banks; bank switching only swaps which view is mapped at 0x4000-0x7FFF
+        self._bank0 = self.rom[:0x4000]
+        self._banks = [self.rom[offset:offset + 0x4000] for offset in range(0, len(self.rom), 0x4000)]
+        self.reset()
 
     def read(self, address: int) -> int:
         if address < 0x4000:
-            return self.rom[address]
+            return self._bank0[address]
         else:
-            return self.rom[address - 0x4000 + self.rom_bank * 0x4000]
+            return self._cur_bank[address - 0x4000]
 
     def write(self, address: int, value: int) -> None:
         if 0x2000 <= address <= 0x3FFF:
             value = value & 0b11111  # select lower 5 bits of bank number
             self.rom_bank = value or 0x01
+            # Bank numbers beyond the ROM size wrap around, as the unused upper bits are not connected
+            self._cur_bank = self._banks[self.rom_bank % len(self._banks)]
+
+    def reset(self) -> None:
+        self.rom_bank = 0x01
+        self._cur_bank = self._banks[self.rom_bank % len(self._banks)]
+
+    @property
+    def mapped_banks(self) -> tuple[memoryview, memoryview]:
+        return self._bank0, self._cur_bank
 
 def detect_mbc(rom: bytes) -> MBC:
     mbc_type = rom[0x0147]
@@ -45,78 +82,144 @@ def detect_mbc(rom: bytes) -> MBC:
         raise NotImplementedError(f"MBC type 0x{mbc_type:02X} not implemented")
 
 class Memory:
+    """
+    The Game Boy's 16-bit address space.
+
+    All regions live in one flat 64 KiB buffer, so reads are a single indexed load. The ROM banks selected by the MBC
+    are copied into 0x0000-0x7FFF whenever a write switches banks, and writes to WRAM are mirrored into echo RAM (and
+    vice versa). The region attributes are views into the buffer.
+    """
+
+    # Fixed attribute layout, as for CPU
+    __slots__ = ("_buf", "_mapped_banks", "_write_table", "eram", "hram", "io", "mbc", "oam", "vram", "wram")
+
     def __init__(self, rom: bytes) -> None:
         self.mbc = detect_mbc(rom)  # 16 KiB ROM bank 00 and 16 KiB ROM bank 01–NN
-        self.vram = bytearray(0x2000)  # 8 KiB Video RAM (VRAM)
-        self.eram = bytearray(0x2000)  # 8 KiB External RAM (ERAM)
-        self.wram = bytearray(0x2000)  # 8 KiB Work RAM (WRAM)
-        self.oam = bytearray(0xA0)  # 160 bytes Object Attribute Memory (OAM)
-        self.io = bytearray(0x80)  # 128 bytes I/O Registers
-        self.hram = bytearray(0x7F)  # 127 bytes High RAM (HRAM)
-        self.ie_register = 0x00  # Interrupt Enable Register
+        self._buf = bytearray(0x10000)
+
+        buf = memoryview(self._buf)
+        self.vram = buf[0x8000:0xA000]  # 8 KiB Video RAM (VRAM)
+        self.eram = buf[0xA000:0xC000]  # 8 KiB External RAM (ERAM)
+        self.wram = buf[0xC000:0xE000]  # 8 KiB Work RAM (WRAM)
+        self.oam = buf[0xFE00:0xFEA0]  # 160 bytes Object Attribute Memory (OAM)
+        self.io = buf[0xFF00:0xFF80]  # 128 bytes I/O Registers
+        self.hram = buf[0xFF80:0xFFFF]  # 127 bytes High RAM (HRAM)
+
+        self._mapped_banks = (None, None)
+        self._map_rom_banks()
+        self._build_page_tables()
+
+    def reset(self) -> None:
+        """Clear all RAM, reset the MBC to its power-on banks and copy them in again, picking up ROM buffer changes"""
+        self._buf[0x8000:] = bytes(0x8000)
+        self.mbc.reset()
+        self._mapped_banks = (None, None)
+        self._map_rom_banks()
+
+    @property
+    def ie_register(self) -> int:
+        """Interrupt Enable Register (0xFFFF)"""
+        return self._buf[0xFFFF]
 
-    def __getitem__(self, address: int) -> int:
-        return self.read(address)
+    @ie_register.setter
+    def ie_register(self, value: int) -> None:
+        self._buf[0xFFFF] = value & 0xFF
 
-    def __setitem__(self, address: int, value: int) -> None:
-        self.write(address, value)
+    @property
+    def buffer(self) -> bytearray:
+        """The flat 64 KiB address space; indexing it reads memory without bounds or region handling"""
+        return self._buf
 
     def read(self, address: int) -> int:
-        if 0x0000 <= address <= 0x7FFF:
-            return self.mbc.read(address)
-        elif 0x8000 <= address <= 0x9FFF:
-            return self.vram[address - 0x8000]
-        elif 0xA000 <= address <= 0xBFFF:
-            return self.eram[address - 0xA000]
-        elif 0xC000 <= address <= 0xCFFF:
-            return self.wram[address - 0xC000]
-        elif 0xD000 <= address <= 0xDFFF:
-            return self.wram[0x1000 + (address - 0xD000)]
-        elif 0xE000 <= address <= 0xFDFF:
-            # Echo RAM (mirror of C000-DDFF)
-            return self.read(address - 0x2000)
-        elif 0xFE00 <= address <= 0xFE9F:
-            return self.oam[address - 0xFE00]
-        elif 0xFEA0 <= address <= 0xFEFF:
-            # Unusable area
-            return 0x00
-        elif 0xFF00 <= address <= 0xFF7F:
-            return self.io[address - 0xFF00]
-        elif 0xFF80 <= address <= 0xFFFE:
-            return self.hram[address - 0xFF80]
-        elif address == 0xFFFF:
-            return self.ie_register
-        else:
+        if 0x0000 <= address <= 0xFFFF:
+            return self._buf[address]
+        # Invalid/unmapped memory; checked explicitly since a negative index would read from the end of the buffer
+        raise ValueError(f"Invalid memory address: 0x{address:04X}")
+
+    def read16(self, address: int) -> int:
+        """Read a little-endian 16-bit value (e.g. an immediate operand) starting at address"""
+        if 0x0000 <= address <= 0xFFFF:
+            buf = self._buf
+            return buf[address] | (buf[(address + 1) & 0xFFFF] << 8)
+        # Invalid/unmapped memory
+        raise ValueError(f"Invalid memory address: 0x{address:04X}")
+
+    def write(self, address: int, value: int):
+        if not 0x0000 <= address <= 0xFFFF:
             # Invalid/unmapped memory
             raise ValueError(f"Invalid memory address: 0x{address:04X}")
+        if 0xFEA0 <= address <= 0xFEFF:
+            raise ValueError(f"Cannot write to unusable memory: 0x{address:04X}")
+        self.store(address, value)
 
-    def write(self, address: int, value: int):
-        value = value & 0xFF  # ensure value is 8 bits
+    def store(self, address: int, value: int) -> None:
+        """
+        Write a byte on behalf of the CPU, without validating the address.
+
+        The address must already be masked to 16 bits. Writes to the unusable area 0xFEA0-0xFEFF are ignored as on
+        hardware, so nothing on the instruction path raises.
+        """
+        handler = self._write_table[address >> 8]
+        if handler is None:
+            self._buf[address] = value & 0xFF  # plain RAM page, ensure value is 8 bits
+        else:
+            handler(address, value & 0xFF)  # ensure value is 8 bits
+
+    # Subscript access (memory[address]) shares the implementation instead of adding a call through read/write
+    __getitem__ = read
+    __setitem__ = write
+
+    def _map_rom_banks(self) -> None:
+        """Copy the ROM banks selected by the MBC into 0x0000-0x7FFF if they changed"""
+        bank0, bank = self.mbc.mapped_banks
+        mapped_bank0, mapped_bank = self._mapped_banks
+        if bank0 is not mapped_bank0:
+            self._buf[:len(bank0)] = bank0
+        if bank is not mapped_bank:
+            self._buf[0x4000:0x4000 + len(bank)] = bank
+        self._mapped_banks = (bank0, bank)
 
-        if 0x0000 <= address <= 0x7FFF:
+    def _build_page_tables(self) -> None:
+        """
+        Map each 256-byte page (the high byte of an address) to the write handler of the region it belongs to.
+
+        Pages of plain RAM map to None and are stored directly by write() without calling a handler.
+        """
+        buf = self._buf
+        mbc_write = self.mbc.write
+        map_rom_banks = self._map_rom_banks
+
+        def write_rom(address: int, value: int) -> None:
             # writing to MBC triggers MBC logic (bank switching, etc.)
-            self.mbc.write(address, value)
-        elif 0x8000 <= address <= 0x9FFF:
-            self.vram[address - 0x8000] = value
-        elif 0xA000 <= address <= 0xBFFF:
-            self.eram[address - 0xA000] = value
-        elif 0xC000 <= address <= 0xCFFF:
-            self.wram[address - 0xC000] = value
-        elif 0xD000 <= address <= 0xDFFF:
-            self.wram[0x1000 + (address - 0xD000)] = value
-        elif 0xE000 <= address <= 0xFDFF:
+            mbc_write(address, value)
+            map_rom_banks()
+
+        def write_wram(address: int, value: int) -> None:
+            # C000-DDFF is mirrored at E000-FDFF (echo RAM)
+            buf[address] = value
+            buf[address + 0x2000] = value
+
+        def write_echo(address: int, value: int) -> None:
             # Echo RAM (mirror of C000-DDFF)
-            self.write(address - 0x2000, value)
-        elif 0xFE00 <= address <= 0xFE9F:
-            self.oam[address - 0xFE00] = value
-        elif 0xFEA0 <= address <= 0xFEFF:
-            # Unusable area
-            raise ValueError(f"Cannot write to unusable memory: 0x{address:04X}")
-        elif 0xFF00 <= address <= 0xFF7F:
-            self.io[address - 0xFF00] = value
-            # TODO: handle IO registers
-        elif 0xFF80 <= address <= 0xFFFE:
-            self.hram[address - 0xFF80] = value
-        else:
-            # Invalid/unmapped memory
-            raise ValueError(f"Invalid memory address: 0x{address:04X}")
+            buf[address] = value
+            buf[address - 0x2000] = value
+
+        def write_oam_page(address: int, value: int) -> None:
+            if address <= 0xFE9F:
+                buf[address] = value  # OAM
+            # Writes to the unusable area (0xFEA0-0xFEFF) are ignored
+
+        regions = (
+            (0x00, 0x7F, write_rom),
+            (0x80, 0x9F, None),  # VRAM
+            (0xA0, 0xBF, None),  # External RAM
+            (0xC0, 0xDD, write_wram),
+            (0xDE, 0xDF, None),  # WRAM without echo
+            (0xE0, 0xFD, write_echo),
+            (0xFE, 0xFE, write_oam_page),  # OAM and unusable area
+            (0xFF, 0xFF, None),  # I/O registers, HRAM and IE; TODO: handle IO registers (0xFF00-0xFF7F)
+        )
+        self._write_table = [None] * 0x100
+        for first_page, last_page, write in regions:
+            for page in range(first_page, last_page + 1):
+                self._write_table[page] = write
@@ -1,5 +1,5 @@
 import argparse
-from cpu import CPU
+from cpu import CPU, CYCLES_PER_FRAME, Halted
 from memory import Memory
 
 def main():
@@ -13,8 +13,11 @@ def main():
 
     cpu = CPU(Memory(rom))
 
-    while not cpu.halted:
-        cpu.step()
+    try:
+        while True:
+            cpu.run_for(CYCLES_PER_FRAME)
+    except Halted:
+        pass
 
 if __name__ == "__main__":
     main()